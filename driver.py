@@ -1,10 +1,13 @@
 import argparse
+import itertools
 import json
 import os
 import subprocess
 import sys
 from datetime import datetime
 
+import resources
+
 kernels = {
     "gemver": "./kernels/gemver",
     "jacobi-2d": "./kernels/jacobi-2d"
@@ -28,7 +31,33 @@ num_nodes = [1, 2, 4, 8, 16, 32]  # MAX UNKNOWN on Euler
 # num_nodes = [1]  # MAX 1 on Apple M3 Max
 
 # interfaces = {"std": "", "omp": "_omp", "mpi": "_mpi"}
-interfaces = {"std": "", "omp": "_omp", "mpi": "_mpi", "omp+mpi": "_omp+mpi"}
+interfaces = {
+    "std": "",
+    "omp": "_omp",
+    "mpi": "_mpi",
+    "omp+mpi": "_omp+mpi",
+    "blocked": "_blocked",
+    "omp_blocked": "_omp_blocked",
+    "mpi_blocked": "_mpi_blocked",
+    "mpi_halo": "_mpi_halo",
+    "mpi_overlap": "_mpi_overlap",
+    "mpi_2d": "_mpi_2d",
+    "omp_numa": "_omp_numa",
+}
+
+# Compile-time parameters swept per interface, every combination is built as its own binary
+interface_params = {
+    "blocked": {"TILE": [64, 128, 256]},
+    "omp_blocked": {"TILE": [64, 128, 256]},
+    "mpi_blocked": {"TILE": [64, 128, 256]},
+    "mpi_halo": {"HALO": [1, 2, 4, 8]},  # Time steps per halo exchange
+    "omp_numa": {"NUMA_INTERLEAVE": [0, 1]},  # 0 = parallel first touch, 1 = interleave all nodes
+}
+
+# Data layout swept for the shared-memory interfaces (see --precisions and --paddings).
+# The MPI interfaces describe their rows with packed MPI_DOUBLE datatypes and always use the defaults.
+# Variants with the default layout keep the plain names, so earlier results stay comparable.
+layout_defaults = {"DTYPE": "double", "PAD": 0}
 
 # Look into affinity, for now this is fine
 
@@ -59,7 +88,7 @@ parser.add_argument(
     "--interfaces",
     type=str,
     nargs="+",
-    help="Interfaces to run (default = all) (selection: 'std', 'omp', 'mpi')",
+    help=f"Interfaces to run (default = std, omp, mpi, omp+mpi) (selection: {', '.join(interfaces)})",
     default=["std", "omp", "mpi", "omp+mpi"]
     # default=["std", "omp", "mpi"]
 )
@@ -79,12 +108,60 @@ parser.add_argument(
     help="Input size for the kernel (e.g., 10000, 25000, 40000)",
     default=None,
 )
+parser.add_argument(
+    "--precisions",
+    type=str,
+    nargs="+",
+    choices=["double", "float"],
+    help="Data types to build the shared-memory interfaces with (default = double)",
+    default=["double"],
+)
+parser.add_argument(
+    "--paddings",
+    type=int,
+    nargs="+",
+    help="Elements of padding at the end of every row of the 2D arrays (default = 0)",
+    default=[0],
+)
 args = parser.parse_args()
 
 if args.size:
     inputsizes["gemver"]["N"] = args.size
     inputsizes["jacobi-2d"]["N"] = args.size
 
+def has_interface(kernel, interface):
+    # Not every kernel implements every interface
+    return os.path.exists(
+        os.path.join(kernels[kernel], f"{kernel}{interfaces[interface]}.c")
+    )
+
+def is_serial(interface):
+    return "omp" not in interface and "mpi" not in interface
+
+def sweep_params(interface):
+    params = dict(interface_params.get(interface, {}))
+    if "mpi" not in interface:
+        params["DTYPE"] = args.precisions
+        params["PAD"] = args.paddings
+    return params
+
+def variants(interface):
+    # Yields (suffix, params) for every combination of the interface's sweep parameters
+    params = sweep_params(interface)
+    for values in itertools.product(*params.values()):
+        variant = dict(zip(params, values))
+        suffix = "".join(
+            f"_{key}_{value}" for key, value in variant.items() if layout_defaults.get(key) != value
+        )
+        yield suffix, variant
+
+def param_flag(key, value):
+    if key == "DTYPE":
+        return f"-DDATA_TYPE_IS_{value.upper()}"
+    if key == "PAD":
+        return f"-DPOLYBENCH_PADDING_FACTOR={value}"
+    return f"-D{key}={value}"
+
 def compile(datasets):
     print(
         "**************************************************\n"
@@ -113,20 +190,30 @@ def compile(datasets):
 
         for filename, inputsize_flags in datasets[kernel].items():
             for interface in args.interfaces:
-                content += f"{filename}_{interface}: {kernel}{interfaces[interface]}.c {kernel}.h\n"
-                content += "\t@mkdir -p bin\n\t${VERBOSE} "
-                content += "${MPI_CC}" if "mpi" in interface else "${CC}"
-                content += f" -o bin/{filename}{interfaces[interface]} "
-                content += f"{kernel}{interfaces[interface]}.c ${{CFLAGS}} -I. -I{utilities_path} "
-                content += f"{pb_source_path} {inputsize_flags} ${{EXTRA_FLAGS}}"
-                # content += " -lnuma"
-                content += " -fopenmp" if interface == "omp" else "" # Only for omp, not for omp+mpi
-                content += "\n\n"
+                if not has_interface(kernel, interface):
+                    continue
+                for suffix, params in variants(interface):
+                    param_flags = " ".join(param_flag(key, value) for key, value in params.items())
+                    content += f"{filename}_{interface}{suffix}: {kernel}{interfaces[interface]}.c {kernel}.h\n"
+                    content += "\t@mkdir -p bin\n\t${VERBOSE} "
+                    content += "${MPI_CC}" if "mpi" in interface else "${CC}"
+                    content += f" -o bin/{filename}{interfaces[interface]}{suffix} "
+                    content += f"{kernel}{interfaces[interface]}.c ${{CFLAGS}} -I. -I{utilities_path} "
+                    content += f"{pb_source_path} {inputsize_flags} "
+                    if param_flags:
+                        content += f"{param_flags} "
+                    content += "${EXTRA_FLAGS}"
+                    content += " -lnuma" if "numa" in interface else ""
+                    content += " -fopenmp" if "omp" in interface and "mpi" not in interface else "" # Only for omp, not for omp+mpi
+                    content += "\n\n"
 
         content += "clean:\n"
         for filename, inputsize_flags in datasets[kernel].items():
             for interface in args.interfaces:
-                content += f"\t@rm -f bin/{filename}{interfaces[interface]}\n"
+                if not has_interface(kernel, interface):
+                    continue
+                for suffix, _ in variants(interface):
+                    content += f"\t@rm -f bin/{filename}{interfaces[interface]}{suffix}\n"
 
         with open(os.path.join(kernels[kernel], "Makefile"), "w") as makefile:
             makefile.write(content)
@@ -149,10 +236,15 @@ def compile(datasets):
         make_cmd = ["make"]
         for filename, _ in datasets[kernel].items():
             for interface in args.interfaces:
-                make_cmd.append(f"{filename}_{interface}")
-                make_process = subprocess.run(
-                    make_cmd, cwd=kernels[kernel], capture_output=True, text=True
-                )
+                if not has_interface(kernel, interface):
+                    continue
+                for suffix, _ in variants(interface):
+                    make_cmd.append(f"{filename}_{interface}{suffix}")
+
+        # One make call per kernel, the targets are phony and would be rebuilt on every call
+        make_process = subprocess.run(
+            make_cmd, cwd=kernels[kernel], capture_output=True, text=True
+        )
 
         if make_process.returncode != 0:
             sys.stderr.write(f"Error running make for kernel {kernel}\n")
@@ -161,9 +253,10 @@ def compile(datasets):
         if args.verbose:
             sys.stdout.write(make_process.stdout)
 
-def run_local(kernel, interface, p, filename, out_dir_run):
+def run_local(kernel, interface, p, filename, suffix, out_dir_run):
     for i in range(args.num_runs):
-        cmd = [os.path.join(".", "bin", f"{filename}{interfaces[interface]}")]
+        # The run index ends up in the timing record of the MPI kernels
+        cmd = [os.path.join(".", "bin", f"{filename}{interfaces[interface]}{suffix}"), str(i)]
         if "mpi" in interface:
             cmd = ["mpiexec", "-np", str(p)] + cmd
         if "omp" in interface:
@@ -192,23 +285,36 @@ def run_local(kernel, interface, p, filename, out_dir_run):
 
         if driver_process.returncode != 0:
             sys.stderr.write(
-                f"Error running driver for kernel {filename}{interfaces[interface]}\n"
+                f"Error running driver for kernel {filename}{interfaces[interface]}{suffix}\n"
             )
             sys.stderr.write(driver_process.stderr)
             sys.exit(1)
 
-def run_euler(kernel, interface, p, n, filename, out_dir_run):
+def run_euler(kernel, interface, p, n, filename, suffix, params, history, out_dir_run):
     sbatch_dir = os.path.join(kernels[kernel], "sbatch")
     os.makedirs(sbatch_dir, exist_ok=True)
 
     # Prepare paths and job name
     binary_path = os.path.join(
-        kernels[kernel], "bin", f"{filename}{interfaces[interface]}"
+        kernels[kernel], "bin", f"{filename}{interfaces[interface]}{suffix}"
+    )
+    sbatch_file = os.path.join(sbatch_dir, f"{filename}{interfaces[interface]}{suffix}.sbatch")
+
+    # Size the request from the working set and the runtimes recorded so far
+    mem_per_cpu, time = resources.slurm_request(
+        history,
+        kernel,
+        filename.split("_N_")[0],  # Kernel label as read_output.py records it
+        interface,
+        f"{interface}{suffix}",
+        inputsizes[kernel],
+        p,
+        params,
+        args.num_runs,
     )
-    sbatch_file = os.path.join(sbatch_dir, f"{filename}{interfaces[interface]}.sbatch")
 
     content = "#!/bin/bash\n"
-    content += "#SBATCH --time=00:04:00\n"
+    content += f"#SBATCH --time={time}\n"
     content += f"#SBATCH -o ./{out_dir_run}/%j.out\n"
     content += f"#SBATCH -e ./{out_dir_run}/%j.err\n"
     # content += "#SBATCH --mem-bind=local\n"
@@ -222,17 +328,17 @@ def run_euler(kernel, interface, p, n, filename, out_dir_run):
     if "mpi" in interface:
         content += f"#SBATCH --nodes={n}\n"
         content += f"#SBATCH --ntasks={p}\n"
-        content += f"#SBATCH --mem-per-cpu={int(mpi_config['total_memory']/p)}\n\n"
+        content += f"#SBATCH --mem-per-cpu={mem_per_cpu}\n\n"
         content += "#SBATCH -C ib\n\n"
-    elif interface == "omp":
+    elif "omp" in interface:
         content += "#SBATCH --nodes=1\n"
         content += "#SBATCH --ntasks=1\n"
         content += f"#SBATCH --cpus-per-task={p}\n"
-        content += f"#SBATCH --mem-per-cpu={int(omp_config['total_memory']/p)}\n\n"
+        content += f"#SBATCH --mem-per-cpu={mem_per_cpu}\n\n"
     else:
         content += "#SBATCH --nodes=1\n"
         content += "#SBATCH --ntasks=1\n"
-        content += f"#SBATCH --mem-per-cpu={omp_config['total_memory']}\n\n"
+        content += f"#SBATCH --mem-per-cpu={mem_per_cpu}\n\n"
         
     if "omp" in interface:
         content += "export OMP_DISPLAY_ENV=TRUE\n"
@@ -244,11 +350,11 @@ def run_euler(kernel, interface, p, n, filename, out_dir_run):
         "module load stack/2024-06 openmpi/4.1.6 openblas/0.3.24 2> /dev/null\n\n"
     )
 
-    content += f"for i in {{1..{args.num_runs}}}; do\n"
+    content += f"for i in {{0..{args.num_runs - 1}}}; do\n"
     if "mpi" in interface:
         content += "srun "
 
-    content += "perf stat " + binary_path + "\n"
+    content += "perf stat " + binary_path + " $i\n"
     content += 'echo "==============="\n'  # stdout
     content += 'echo "===============" >&2\n'  # stderr
     content += "done\n\n"
@@ -275,7 +381,7 @@ def run_euler(kernel, interface, p, n, filename, out_dir_run):
     submission = subprocess.run(
         [
             "sbatch",
-            f"--job-name={filename}{interfaces[interface]}_np{p}",
+            f"--job-name={filename}{interfaces[interface]}{suffix}_np{p}",
             sbatch_file,
         ],
         capture_output=True,
@@ -300,55 +406,70 @@ def run(datasets, on_euler):
     with open(os.path.join(output_dir, "inputsizes.json"), "w") as f:
         json.dump(inputsizes, f, indent=4)
 
+    history = resources.load_history() if on_euler else []
+
     for kernel in args.kernels:
         if args.verbose:
             print("Running kernel: %s" % kernel)
         for filename, _ in datasets[kernel].items():
             for interface in args.interfaces:
+                if not has_interface(kernel, interface):
+                    continue
                 if args.verbose:
                     print("-Running interface: %s" % interface)
                 for p in num_processes:
-                    if interface == "std" and p != 1 or interface != "std" and p == 1:
+                    if is_serial(interface) and p != 1 or not is_serial(interface) and p == 1:
                         continue
                     if args.verbose:
                         print("--Running processes: %s" % p)
                     for n in num_nodes:
-                        if interface == "mpi" and n == 1 or interface != "mpi" and n != 1:
+                        multi_node = "mpi" in interface and "omp" not in interface
+                        if multi_node and n == 1 or not multi_node and n != 1:
                             continue
                         if args.verbose:
                             print("---Running num_nodes: %s" % n)
-
-                        out_dir_run = os.path.join(
-                            # np = number of processes, nn = number of nodes
-                            output_dir, f"{filename}_np_{p}_nn_{n}_{interface}"
-                        )
-                        os.makedirs(out_dir_run, exist_ok=True)
-                        
-                        with open(
-                            os.path.join(output_dir, f"{interface}.json"),
-                            "w",
-                        ) as f:
-                            json.dump(mpi_config, f, indent=4)
-
-                        # Local
-                        if on_euler:
-                            run_euler(
-                                kernel,
-                                interface,
-                                p,
-                                n,
-                                filename,
-                                out_dir_run,
-                            )
-                        # Euler
-                        else:
-                            run_local(
-                                kernel,
-                                interface,
-                                p,
-                                filename,
-                                out_dir_run,
+                        for suffix, params in variants(interface):
+                            out_dir_run = os.path.join(
+                                # np = number of processes, nn = number of nodes
+                                output_dir, f"{filename}_np_{p}_nn_{n}_{interface}{suffix}"
                             )
+                            os.makedirs(out_dir_run, exist_ok=True)
+
+                            with open(
+                                os.path.join(output_dir, f"{interface}.json"),
+                                "w",
+                            ) as f:
+                                config = mpi_config if "mpi" in interface else omp_config
+                                # Also records the swept compile-time parameters, e.g. the NUMA placement
+                                json.dump(
+                                    {**config, "params": sweep_params(interface)},
+                                    f,
+                                    indent=4,
+                                )
+
+                            # Local
+                            if on_euler:
+                                run_euler(
+                                    kernel,
+                                    interface,
+                                    p,
+                                    n,
+                                    filename,
+                                    suffix,
+                                    params,
+                                    history,
+                                    out_dir_run,
+                                )
+                            # Euler
+                            else:
+                                run_local(
+                                    kernel,
+                                    interface,
+                                    p,
+                                    filename,
+                                    suffix,
+                                    out_dir_run,
+                                )
 
 
 def main():
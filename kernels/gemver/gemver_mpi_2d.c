@@ -0,0 +1,247 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h> 
+#include <assert.h>
+#include <mpi.h>
+#include <mpi_timing.h>
+
+// Problem size
+// #define N 30000
+#ifndef N 
+#define N 25000
+#endif
+
+// Data type
+#define DATA_TYPE double
+#define MPI_DATA_TYPE MPI_DOUBLE
+
+#define MALLOC_1D(name, type, nelems) \
+ type *name = (type *)xmalloc((size_t)(nelems) * sizeof(type))
+
+// 2D Allocation Macro (1D memory layout to ensure contiguity and efficiency)
+#define MALLOC_2D(name, type, nrows, ncols) \
+ type *name = (type *)xmalloc((size_t)(nrows) * (size_t)(ncols) * sizeof(type))
+
+// For 2D indexing (if)
+#define IDX_2D(name, row, col, ncols) name[(row) * (ncols) + (col)]
+
+
+static void* xmalloc(size_t alloc_sz)
+{
+  void* ret = NULL;
+
+  int err = posix_memalign (&ret, 64, alloc_sz);
+  if (! ret || err)
+    {
+      fprintf (stderr, "[PolyBench] posix_memalign: cannot allocate memory");
+      exit (1);
+    }   
+
+    return ret;
+}
+
+
+void flush_cache()
+{
+  int cs = 32770 * 1024 * 2 / sizeof(double);
+  double* flush = (double*) calloc (cs, sizeof(double));
+  int i;
+  double tmp = 0.0;
+  for (i = 0; i < cs; i++)
+    tmp += flush[i];
+  assert (tmp <= 10.0);
+  free (flush);
+}
+
+// Size and offset of block i when n elements are split into p blocks
+#define BLOCK_SIZE(n, p, i) ((n) / (p) + ((i) < (n) % (p) ? 1 : 0))
+#define BLOCK_START(n, p, i) ((i) * ((n) / (p)) + ((i) < (n) % (p) ? (i) : (n) % (p)))
+
+void init_data(
+    DATA_TYPE *alpha,
+    DATA_TYPE *beta,
+    DATA_TYPE *u1,
+    DATA_TYPE *u2, 
+    DATA_TYPE *v1,
+    DATA_TYPE *v2, 
+    DATA_TYPE *y,
+    DATA_TYPE *z,
+    DATA_TYPE *A,
+    int start_row,
+    int num_rows,
+    int start_col,
+    int num_cols) {
+
+    DATA_TYPE fn = (DATA_TYPE) N;
+    *alpha = 1.5;
+    *beta = 1.2;
+
+    int i;
+
+    // Row-indexed vectors follow the block rows, col-indexed vectors the block cols
+    for (i = start_col; i < start_col + num_cols; i++)
+    {   
+        v1[i-start_col] = ((i+1)/fn)/4.0;
+        v2[i-start_col] = ((i+1)/fn)/6.0;
+        z[i-start_col] = ((i+1)/fn)/9.0;
+    }
+    for (i = start_row; i < start_row + num_rows; i++) {
+        u1[i-start_row] = i;
+        u2[i-start_row] = ((i+1)/fn)/2.0;
+        y[i-start_row] = ((i+1)/fn)/8.0;
+        for (int j = start_col; j < start_col + num_cols; j++){
+            IDX_2D(A, i-start_row, j-start_col, num_cols) = (DATA_TYPE) (i*j % N) / N;
+        }
+    }
+}
+
+void kernel_gemver(DATA_TYPE alpha,
+    DATA_TYPE beta,
+    DATA_TYPE *u1,
+    DATA_TYPE *u2, 
+    DATA_TYPE *v1,
+    DATA_TYPE *v2, 
+    DATA_TYPE *y,
+    DATA_TYPE *z,
+    DATA_TYPE *x,
+    DATA_TYPE *w,
+    DATA_TYPE *A,
+    int num_rows,
+    int num_cols,
+    MPI_Comm row_comm,
+    MPI_Comm col_comm) {
+    int i, j;
+    int p_row, p_col, dim_row, dim_col;
+
+    MPI_Comm_rank(col_comm, &p_row);
+    MPI_Comm_size(col_comm, &dim_row);
+    MPI_Comm_rank(row_comm, &p_col);
+    MPI_Comm_size(row_comm, &dim_col);
+
+    // Every rank of a column owns a piece of x, every rank of a row a piece of w
+    int x_counts[dim_row], x_displs[dim_row];
+    for (i = 0; i < dim_row; i++) {
+        x_counts[i] = BLOCK_SIZE(num_cols, dim_row, i);
+        x_displs[i] = BLOCK_START(num_cols, dim_row, i);
+    }
+    int w_counts[dim_col];
+    for (i = 0; i < dim_col; i++)
+        w_counts[i] = BLOCK_SIZE(num_rows, dim_col, i);
+
+    // Step 3: Every process updates its block of A^ and computes partial sums
+    // of x for its block cols using its block rows of y
+    for (j = 0; j < num_cols; j++)
+        x[j] = 0.0;
+    for (i = 0; i < num_rows; i++) {
+        for (j = 0; j < num_cols; j++) {
+            IDX_2D(A, i, j, num_cols) = IDX_2D(A, i, j, num_cols) + u1[i] * v1[j] + u2[i] * v2[j];
+            x[j] = x[j] + beta * IDX_2D(A, i, j, num_cols) * y[i];
+        }
+    }
+
+    // Step 4: Sum the partial x down each process column, every rank keeps
+    // one piece and adds z to it, then the column shares the full block of x.
+    // The reduced piece lands at the front of x, move it back to its offset.
+    MPI_Reduce_scatter(MPI_IN_PLACE, x, x_counts, MPI_DATA_TYPE, MPI_SUM, col_comm);
+    for (i = x_counts[p_row] - 1; i >= 0; i--)
+        x[x_displs[p_row] + i] = x[i] + z[x_displs[p_row] + i];
+    MPI_Allgatherv(MPI_IN_PLACE, 0, MPI_DATA_TYPE, x, x_counts, x_displs, MPI_DATA_TYPE, col_comm);
+
+    // Step 5: Every process computes partial sums of w for its block rows,
+    // summed along each process row so every rank keeps one piece of w
+    // (at the front of w)
+    for (i = 0; i < num_rows; i++) {
+        w[i] = 0.0;
+        for (j = 0; j < num_cols; j++) {
+            w[i] += alpha * IDX_2D(A, i, j, num_cols) * x[j];
+        }
+    }
+    MPI_Reduce_scatter(MPI_IN_PLACE, w, w_counts, MPI_DATA_TYPE, MPI_SUM, row_comm);
+}
+
+
+int main(int argc, char** argv) {
+    /* Retrieve problem size. */
+    int n = N;
+
+    // MPI vars 
+    int rank, size;
+
+    // Initialize MPI
+    MPI_Init(&argc, &argv);
+    MPI_Comm_rank(MPI_COMM_WORLD, &rank);
+    MPI_Comm_size(MPI_COMM_WORLD, &size);
+
+    // Step 0: Arrange the processes in a 2D grid, with sub-communicators for
+    // the process rows and the process columns
+    int dims[2] = {0, 0};
+    int periods[2] = {0, 0};
+    MPI_Dims_create(size, 2, dims);
+    MPI_Comm cart_comm, row_comm, col_comm;
+    MPI_Cart_create(MPI_COMM_WORLD, 2, dims, periods, 0, &cart_comm);
+
+    int keep_cols[2] = {0, 1};
+    int keep_rows[2] = {1, 0};
+    MPI_Cart_sub(cart_comm, keep_cols, &row_comm);
+    MPI_Cart_sub(cart_comm, keep_rows, &col_comm);
+
+    int coords[2];
+    MPI_Cart_coords(cart_comm, rank, 2, coords);
+
+    // Step 1: Compute which block of A this process is responsible for
+    int start_row = BLOCK_START(n, dims[0], coords[0]);
+    int num_rows = BLOCK_SIZE(n, dims[0], coords[0]);
+    int start_col = BLOCK_START(n, dims[1], coords[1]);
+    int num_cols = BLOCK_SIZE(n, dims[1], coords[1]);
+
+    /* Variable declaration/allocation. */
+    DATA_TYPE alpha;
+    DATA_TYPE beta; 
+    MALLOC_1D(u1, DATA_TYPE, num_rows);
+    MALLOC_1D(u2, DATA_TYPE, num_rows);
+    MALLOC_1D(v1, DATA_TYPE, num_cols);
+    MALLOC_1D(v2, DATA_TYPE, num_cols);
+    MALLOC_1D(y, DATA_TYPE, num_rows);
+    MALLOC_1D(z, DATA_TYPE, num_cols);
+    MALLOC_1D(x, DATA_TYPE, num_cols);
+    MALLOC_1D(w, DATA_TYPE, num_rows);
+    MALLOC_2D(A, DATA_TYPE, num_rows, num_cols);
+    
+    /* Initialize array(s). */
+    // Step 2: Initialize the local arrays
+    init_data(&alpha, &beta, u1, u2, v1, v2, y, z, A, start_row, num_rows, start_col, num_cols);
+    
+    flush_cache();
+
+    struct timespec start, end; 
+    clock_gettime(CLOCK_MONOTONIC_RAW, &start);
+    
+    kernel_gemver(alpha, beta, u1, u2, v1, v2, y, z, x, w, A, num_rows, num_cols, row_comm, col_comm); 
+
+    clock_gettime(CLOCK_MONOTONIC_RAW, &end);
+
+    // Rank 0 prints one record with the min/max/mean time over all ranks
+    char config[64];
+    snprintf(config, sizeof(config), "\"N\": %d", N);
+    print_timing("gemver_mpi_2d", timing_run_index(argc, argv), config,
+                 (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec), MPI_COMM_WORLD);
+
+    // Don't forget to free allocated memory
+    free(u1);
+    free(u2);
+    free(v1);
+    free(v2);
+    free(y);
+    free(z);
+    free(x);
+    free(w);
+    free(A);
+
+    MPI_Comm_free(&row_comm);
+    MPI_Comm_free(&col_comm);
+    MPI_Comm_free(&cart_comm);
+
+    MPI_Finalize(); 
+
+    return 0;
+}
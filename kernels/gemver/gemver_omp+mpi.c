@@ -3,6 +3,7 @@
 #include <time.h> 
 #include <assert.h>
 #include <mpi.h>
+#include <mpi_timing.h>
 
 // Problem size
 // #define N 30000
@@ -192,7 +193,11 @@ int main(int argc, char** argv) {
 
     clock_gettime(CLOCK_MONOTONIC_RAW, &end);
 
-    printf("Rank %d, Time: %f\n", rank,(end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec));
+    // Rank 0 prints one record with the min/max/mean time over all ranks
+    char config[64];
+    snprintf(config, sizeof(config), "\"N\": %d", N);
+    print_timing("gemver_omp+mpi", timing_run_index(argc, argv), config,
+                 (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec), MPI_COMM_WORLD);
 
     // check that A is computed correctly
 //    printf("Rows %d - %d, Gathered A:\n", start_row, start_row + num_rows-1);
@@ -11,18 +11,27 @@
 #define N 25000
 #endif
 
-// Data type
+// Data type, -DDATA_TYPE_IS_FLOAT for single precision
+#ifdef DATA_TYPE_IS_FLOAT
+#define DATA_TYPE float
+#else
 #define DATA_TYPE double
+#endif
+
+// Elements of padding at the end of every row of A, breaks up cache-set conflicts at power-of-two N
+#ifndef POLYBENCH_PADDING_FACTOR
+#define POLYBENCH_PADDING_FACTOR 0
+#endif
 
 #define MALLOC_1D(name, type, nelems) \
  type *name = (type *)xmalloc((size_t)(nelems) * sizeof(type))
 
 // 2D Allocation Macro (1D memory layout to ensure contiguity and efficiency)
 #define MALLOC_2D(name, type, nrows, ncols) \
- type *name = (type *)xmalloc((size_t)(nrows) * (size_t)(ncols) * sizeof(type))
+ type *name = (type *)xmalloc((size_t)(nrows) * (size_t)((ncols) + POLYBENCH_PADDING_FACTOR) * sizeof(type))
 
 // For 2D indexing (if)
-#define IDX_2D(name, row, col, ncols) name[(row) * (ncols) + (col)]
+#define IDX_2D(name, row, col, ncols) name[(row) * ((ncols) + POLYBENCH_PADDING_FACTOR) + (col)]
 
 
 static void* xmalloc(size_t alloc_sz)
@@ -168,6 +177,12 @@ int main(int argc, char** argv) {
 
     printf("Time: %f\n", (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec));
 
+    // Sum of the result, read_output.py compares it against the double precision build
+    double checksum = 0.0;
+    for (int i = 0; i < N; i++)
+        checksum += w[i];
+    printf("Checksum: %.15e\n", checksum);
+
     // Don't forget to free allocated memory
     free(u1);
     free(u2);
@@ -90,6 +90,23 @@ void kernel_jacobi_2d(int tsteps,
 }
 
 
+/* Sum of the live-out data, read_output.py compares it against the
+   double precision build. */
+static
+double checksum_array(int n,
+		      DATA_TYPE POLYBENCH_2D(A,N,N,n,n))
+{
+  int i, j;
+  double sum = 0.0;
+
+  for (i = 0; i < n; i++)
+    for (j = 0; j < n; j++)
+      sum += A[i][j];
+
+  return sum;
+}
+
+
 int main(int argc, char** argv)
 {
   /* Retrieve problem size. */
@@ -115,6 +132,7 @@ int main(int argc, char** argv)
   clock_gettime(CLOCK_MONOTONIC_RAW, &end);
 
   printf("Time: %f\n", (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec));
+  printf("Checksum: %.15e\n", checksum_array(n, POLYBENCH_ARRAY(A)));
 
   // Don't forget to free allocated memory
   POLYBENCH_FREE_ARRAY(A);
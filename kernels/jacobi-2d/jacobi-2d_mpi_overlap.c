@@ -0,0 +1,393 @@
+#include <stdio.h>
+#include <unistd.h>
+#include <string.h>
+#include <math.h>
+#include <mpi.h>
+#include <mpi_timing.h>
+#include <time.h> 
+#include <assert.h>
+
+/* Include polybench common header. */
+#include <polybench.h>
+
+/* Include benchmark-specific header. */
+#include "jacobi-2d.h"
+
+void flush_cache()
+{
+  int cs = 32770 * 1024 * 2 / sizeof(double);
+  double* flush = (double*) calloc (cs, sizeof(double));
+  int i;
+  double tmp = 0.0;
+  for (i = 0; i < cs; i++)
+    tmp += flush[i];
+  assert (tmp <= 10.0);
+  free (flush);
+}
+
+/* Array initialization. */
+static void init_array(int n, // Size of the total matrix
+                       int start_row, // Start row of the block
+                       int start_col, // Start col of the block
+                       int block_height, // Height of the block
+                       int block_length, // Length of the block
+                       DATA_TYPE POLYBENCH_2D(A, block_height + 2, block_length + 2, block_height + 2, block_length + 2), // Block A
+                       DATA_TYPE POLYBENCH_2D(B, block_height + 2, block_length + 2, block_height + 2, block_length + 2)) // Block B
+{
+  // Iterate over all elements of the block with a padding of 1
+  for (int i = 0; i < block_height + 2; i++) {
+    for (int j = 0; j < block_length + 2; j++) {
+      A[i][j] = ((DATA_TYPE)(start_row + i) * (start_col + j + 2) + 2) / n;
+      B[i][j] = ((DATA_TYPE)(start_row + i) * (start_col + j + 3) + 3) / n;
+    }
+  }
+}
+
+static void init_res_array(int n,
+                           DATA_TYPE POLYBENCH_2D(A_res, N, N, n, n)) // Block A_res
+{
+  for (int i = 0; i < n; i++) {
+    for (int j = 0; j < n; j++) {
+      A_res[i][j] = ((DATA_TYPE)(i) * (j + 2) + 2) / n;
+    }
+  }
+}
+
+/* DCE code. Must scan the entire live-out data.
+   Can be used also to check the correctness of the output. */
+static void print_inner_array(int rank, // Rank of the process
+                        int block_height, // Height of the block
+                        int block_length, // Length of the block
+                        DATA_TYPE POLYBENCH_2D(A, block_height+2, block_length+2, block_height+2, block_length+2))
+
+{
+  POLYBENCH_DUMP_START;
+  fprintf(POLYBENCH_DUMP_TARGET, "Rank %d\n", rank);
+  POLYBENCH_DUMP_BEGIN("A\n");
+
+
+  for (int i = 1; i < block_height + 1; i++) {
+    for (int j = 1; j < block_length + 1; j++) {
+      fprintf(POLYBENCH_DUMP_TARGET, DATA_PRINTF_MODIFIER, A[i][j]);
+    }
+    fprintf(POLYBENCH_DUMP_TARGET, "\n");
+  }
+  POLYBENCH_DUMP_END("A");
+  POLYBENCH_DUMP_FINISH;
+}
+
+/* DCE code. Must scan the entire live-out data.
+   Can be used also to check the correctness of the output. */
+static void print_outer_array(int rank, // Rank of the process
+                        int block_height, // Height of the block
+                        int block_length, // Length of the block
+                        DATA_TYPE POLYBENCH_2D(A, block_height + 2, block_length + 2, block_height + 2, block_length + 2))
+
+{
+  POLYBENCH_DUMP_START;
+  fprintf(POLYBENCH_DUMP_TARGET, "Rank %d\n", rank);
+  POLYBENCH_DUMP_BEGIN("A\n");
+
+
+  for (int i = 0; i < block_height + 2; i++) {
+    for (int j = 0; j < block_length + 2; j++) {
+      fprintf(POLYBENCH_DUMP_TARGET, DATA_PRINTF_MODIFIER, A[i][j]);
+    }
+    fprintf(POLYBENCH_DUMP_TARGET, "\n");
+  }
+  POLYBENCH_DUMP_END("A");
+  POLYBENCH_DUMP_FINISH;
+}
+
+/* DCE code. Must scan the entire live-out data.
+   Can be used also to check the correctness of the output. */
+static void print_res_array(int n,
+                        DATA_TYPE POLYBENCH_2D(A_res, N, N, n, n))
+
+{
+  POLYBENCH_DUMP_START;
+  POLYBENCH_DUMP_BEGIN("A\n");
+
+
+  for (int i = 0; i < n; i++) {
+    for (int j = 0; j < n; j++) {
+      fprintf(POLYBENCH_DUMP_TARGET, DATA_PRINTF_MODIFIER, A_res[i][j]);
+    }
+    fprintf(POLYBENCH_DUMP_TARGET, "\n");
+  }
+  POLYBENCH_DUMP_END("A");
+  POLYBENCH_DUMP_FINISH;
+}
+
+/* 5-point stencil from in to out over rows [i_lo, i_hi) and cols [j_lo, j_hi). */
+static void stencil_block(int block_height, // Height of the block
+                          int block_length, // Length of the block
+                          DATA_TYPE POLYBENCH_2D(out, block_height+2, block_length+2, block_height+2, block_length+2),
+                          DATA_TYPE POLYBENCH_2D(in, block_height+2, block_length+2, block_height+2, block_length+2),
+                          int i_lo,
+                          int i_hi,
+                          int j_lo,
+                          int j_hi)
+{
+  for (int i = i_lo; i < i_hi; i++) {
+    for (int j = j_lo; j < j_hi; j++) {
+      out[i][j] = SCALAR_VAL(0.2) * (in[i][j] + in[i][j - 1] + in[i][1 + j] + in[1 + i][j] + in[i - 1][j]);
+    }
+  }
+}
+
+/* Stencil on the outermost owned rows and cols, which read the halo. */
+static void stencil_boundary(int block_height, // Height of the block
+                             int block_length, // Length of the block
+                             DATA_TYPE POLYBENCH_2D(out, block_height+2, block_length+2, block_height+2, block_length+2),
+                             DATA_TYPE POLYBENCH_2D(in, block_height+2, block_length+2, block_height+2, block_length+2))
+{
+  stencil_block(block_height, block_length, out, in, 1, 2, 1, block_length + 1);
+  if (block_height > 1)
+    stencil_block(block_height, block_length, out, in, block_height, block_height + 1, 1, block_length + 1);
+  stencil_block(block_height, block_length, out, in, 2, block_height, 1, 2);
+  if (block_length > 1)
+    stencil_block(block_height, block_length, out, in, 2, block_height, block_length, block_length + 1);
+}
+
+/* Set up persistent halo exchange requests for one array. */
+static void init_halo_requests(int block_height, // Height of the block
+                               int block_length, // Length of the block
+                               DATA_TYPE POLYBENCH_2D(A, block_height+2, block_length+2, block_height+2, block_length+2),
+                               MPI_Datatype row_type,
+                               MPI_Datatype col_type,
+                               int up,
+                               int down,
+                               int left,
+                               int right,
+                               MPI_Comm cart_comm,
+                               MPI_Request *requests)
+{
+  MPI_Send_init(&A[1][1],            1, row_type, up,    0, cart_comm, &requests[0]);
+  MPI_Send_init(&A[block_height][1], 1, row_type, down,  0, cart_comm, &requests[1]);
+  MPI_Send_init(&A[1][block_length], 1, col_type, right, 0, cart_comm, &requests[2]);
+  MPI_Send_init(&A[1][1],            1, col_type, left,  0, cart_comm, &requests[3]);
+
+  MPI_Recv_init(&A[0][1],              1, row_type, up,    0, cart_comm, &requests[4]);
+  MPI_Recv_init(&A[block_height+1][1], 1, row_type, down,  0, cart_comm, &requests[5]);
+  MPI_Recv_init(&A[1][block_length+1], 1, col_type, right, 0, cart_comm, &requests[6]);
+  MPI_Recv_init(&A[1][0],              1, col_type, left,  0, cart_comm, &requests[7]);
+}
+
+/* Main computational kernel. The whole function will be timed,
+   including the call and return. */
+static void kernel_jacobi_2d(int tsteps,
+                             int block_height, // Height of the block
+                             int block_length, // Length of the block
+                             int p_row, // This block's row within all blocks
+                             int p_col, // This block's col within all blocks
+                             DATA_TYPE POLYBENCH_2D(A, block_height+2, block_length+2, block_height+2, block_length+2),
+                             DATA_TYPE POLYBENCH_2D(B, block_height+2, block_length+2, block_height+2, block_length+2),
+                             int rank,
+                             int size,
+                             MPI_Comm cart_comm)
+{
+  int t, i;
+
+#pragma scop
+
+  // Create MPI Datatypes for rows and columns
+  MPI_Datatype row_type, col_type;
+  MPI_Type_contiguous(block_length, MPI_DOUBLE, &row_type);
+  MPI_Type_commit(&row_type);
+  MPI_Type_vector(block_height, 1, block_length + 2, MPI_DOUBLE, &col_type);
+  MPI_Type_commit(&col_type);
+
+  int coords[2];
+  int up, down, left, right;
+  MPI_Cart_coords(cart_comm, rank, 2, coords);
+
+  // Determine neighbors
+  MPI_Cart_shift(cart_comm, 0, 1, &up, &down);
+  MPI_Cart_shift(cart_comm, 1, 1, &left, &right);
+
+  // The halo buffers never move, so the requests are set up once and restarted every step
+  MPI_Request requests_A[8], requests_B[8];
+  init_halo_requests(block_height, block_length, A, row_type, col_type, up, down, left, right, cart_comm, requests_A);
+  init_halo_requests(block_height, block_length, B, row_type, col_type, up, down, left, right, cart_comm, requests_B);
+
+  for (t = 0; t < _PB_TSTEPS; t++) {
+
+    // Update the interior of B while the halo of A is in flight
+    MPI_Startall(8, requests_A);
+    stencil_block(block_height, block_length, B, A, 2, block_height, 2, block_length);
+    MPI_Waitall(8, requests_A, MPI_STATUSES_IGNORE);
+    stencil_boundary(block_height, block_length, B, A);
+
+    // Same for A while the halo of B is in flight
+    MPI_Startall(8, requests_B);
+    stencil_block(block_height, block_length, A, B, 2, block_height, 2, block_length);
+    MPI_Waitall(8, requests_B, MPI_STATUSES_IGNORE);
+    stencil_boundary(block_height, block_length, A, B);
+  }
+
+  for (i = 0; i < 8; i++) {
+    MPI_Request_free(&requests_A[i]);
+    MPI_Request_free(&requests_B[i]);
+  }
+
+  MPI_Type_free(&row_type);
+  MPI_Type_free(&col_type);
+
+#pragma endscop
+}
+
+/* Main computational kernel. The whole function will be timed,
+   including the call and return. */
+static void gather_results(int n,
+                          int block_height, // Height of the block
+                          int block_length, // Length of the block
+                          DATA_TYPE POLYBENCH_2D(A, block_height+2, block_length+2, block_height+2, block_length+2),
+                          DATA_TYPE POLYBENCH_2D(A_res, N, N, n, n),
+                          int rank,
+                          int size,
+                          MPI_Comm cart_comm)
+{
+  int coords[2];
+  MPI_Cart_coords(cart_comm, rank, 2, coords);
+
+  MPI_Datatype block_type, res_block_type;
+  MPI_Type_vector(block_height, block_length, block_length + 2, MPI_DOUBLE, &block_type);
+  MPI_Type_commit(&block_type);
+  
+  MPI_Type_vector(block_height, block_length, N, MPI_DOUBLE, &res_block_type);
+  MPI_Type_commit(&res_block_type);
+
+  if (rank != 0) {
+    MPI_Send(&A[1][1], 1, block_type, 0, 0, cart_comm);
+  } else {
+    MPI_Request receive_requests[size];
+    for (int i = 1; i < size; i++) {
+      int proc_coords[2];
+      MPI_Cart_coords(cart_comm, i, 2, proc_coords);
+      int row = proc_coords[0] * block_height + 1;
+      int col = proc_coords[1] * block_length + 1;
+      MPI_Irecv(&A_res[row][col], 1, res_block_type, i, 0, cart_comm, &receive_requests[i-1]);
+    }
+
+    /* Only the owned block, the ghost cells belong to the blocks being received. */
+    for (int i = 0; i < block_height; i++)
+      for (int j = 0; j < block_length; j++)
+        A_res[i+1][j+1] = A[i+1][j+1];
+
+
+    MPI_Waitall(size-1, receive_requests, MPI_STATUSES_IGNORE);
+  }
+
+
+  MPI_Type_free(&block_type);
+  MPI_Type_free(&res_block_type);
+}
+
+int main(int argc, char **argv)
+{
+  /* Retrieve problem size. */
+  int n = N;
+  int tsteps = TSTEPS;
+
+  /* MPI vars */
+  int rank, size;
+
+  /* Initialize MPI */
+  MPI_Init(&argc, &argv);
+  MPI_Comm_rank(MPI_COMM_WORLD, &rank);
+  MPI_Comm_size(MPI_COMM_WORLD, &size);
+
+  int dims[2] = {0, 0};
+  int periods[2] = {0, 0};
+  MPI_Dims_create(size, 2, dims);
+  MPI_Comm cart_comm;
+  MPI_Cart_create(MPI_COMM_WORLD, 2, dims, periods, 0, &cart_comm);
+
+  /* Calculate number of row and col processes */
+
+  int p_row = rank / dims[1]; // This block's row within all blocks
+  int p_col = rank % dims[1]; // This block's col within all blocks
+  int block_height = (n - 2) / dims[0];
+  int block_length = (n - 2) / dims[1];
+  int start_row = p_row * block_height;
+  int start_col = p_col * block_length;
+
+  /* Variable declaration/allocation. */
+  POLYBENCH_2D_ARRAY_DECL(A,
+                          DATA_TYPE,
+                          block_height + 2,
+                          block_length + 2,
+                          block_height + 2,
+                          block_length + 2);
+  POLYBENCH_2D_ARRAY_DECL(B,
+                          DATA_TYPE,
+                          block_height + 2,
+                          block_length + 2,
+                          block_height + 2,
+                          block_length + 2);
+
+  /* Initialize array(s). */
+  init_array(n,
+             start_row,
+             start_col,
+             block_height,
+             block_length,
+             POLYBENCH_ARRAY(A),
+             POLYBENCH_ARRAY(B));
+
+  flush_cache();
+
+  struct timespec start, end; 
+  clock_gettime(CLOCK_MONOTONIC_RAW, &start);
+
+  /* Run kernel. */
+  kernel_jacobi_2d(tsteps,
+                   block_height,
+                   block_length,
+                   p_row,
+                   p_col,
+                   POLYBENCH_ARRAY(A),
+                   POLYBENCH_ARRAY(B),
+                   rank,
+                   size,
+                   cart_comm);
+
+  clock_gettime(CLOCK_MONOTONIC_RAW, &end);
+
+  // Rank 0 prints one record with the min/max/mean time over all ranks
+  char config[64];
+  snprintf(config, sizeof(config), "\"N\": %d, \"TSTEPS\": %d", N, TSTEPS);
+  print_timing("jacobi-2d_mpi_overlap", timing_run_index(argc, argv), config,
+               (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec), MPI_COMM_WORLD);
+
+  // Gather all data in rank 0
+  double (*A_res)[N][N] = NULL;
+  if(rank == 0) {
+    A_res = (double(*)[N][N])malloc((N) * (N) * sizeof(double));
+    init_res_array(n, POLYBENCH_ARRAY(A_res));
+  }
+
+  gather_results(n,
+                block_height,
+                block_length,
+                POLYBENCH_ARRAY(A),
+                POLYBENCH_ARRAY(A_res),
+                rank,
+                size,
+                cart_comm);
+  
+  if (rank == 0) {
+    polybench_prevent_dce(print_res_array(n, POLYBENCH_ARRAY(A_res)));
+    free((void*)A_res);
+  }
+
+
+  /* Be clean. */
+  POLYBENCH_FREE_ARRAY(A);
+  POLYBENCH_FREE_ARRAY(B);
+
+  MPI_Finalize();
+
+  return 0;
+}
@@ -4,6 +4,7 @@
 #include <time.h>
 #include <math.h>
 #include <mpi.h>
+#include <mpi_timing.h>
 #include <assert.h>
 
 #include <polybench.h>
@@ -313,7 +314,11 @@ int main(int argc, char **argv)
 
   clock_gettime(CLOCK_MONOTONIC_RAW, &end);
 
-  printf("Rank %d, Time: %f\n", rank,(end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec));
+  // Rank 0 prints one record with the min/max/mean time over all ranks
+  char config[64];
+  snprintf(config, sizeof(config), "\"N\": %d, \"TSTEPS\": %d", N, TSTEPS);
+  print_timing("jacobi-2d_omp+mpi", timing_run_index(argc, argv), config,
+               (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec), MPI_COMM_WORLD);
 
   // // Gather all data in rank 0
 
@@ -0,0 +1,169 @@
+#include <stdio.h>
+#include <unistd.h>
+#include <string.h>
+#include <time.h>
+#include <math.h>
+#include <assert.h>
+
+/* Page placement: 0 = first touch by the computing thread, 1 = interleave over all NUMA nodes */
+#ifndef NUMA_INTERLEAVE
+#define NUMA_INTERLEAVE 0
+#endif
+
+#if NUMA_INTERLEAVE
+#include <numa.h>
+#endif
+
+/* Include polybench common header. */
+#include <polybench.h>
+
+/* Include benchmark-specific header. */
+#include "jacobi-2d.h"
+
+void flush_cache()
+{
+  int cs = 32770 * 1024 * 2 / sizeof(double);
+  double* flush = (double*) calloc (cs, sizeof(double));
+  int i;
+  double tmp = 0.0;
+  for (i = 0; i < cs; i++)
+    tmp += flush[i];
+  assert (tmp <= 10.0);
+  free (flush);
+}
+
+/* Array initialization. */
+static
+void init_array (int n,
+		 DATA_TYPE POLYBENCH_2D(A,N,N,n,n),
+		 DATA_TYPE POLYBENCH_2D(B,N,N,n,n))
+{
+  int i, j;
+
+  /* First touch the rows with the same static schedule as the kernel,
+     so every thread's rows end up on its own NUMA node. */
+  #pragma omp parallel for private(j) schedule(static)
+  for (i = 1; i < n - 1; i++) {
+    for (j = 0; j < n; j++) { 
+      A[i][j] = ((DATA_TYPE) i*(j+2) + 2) / n;
+      B[i][j] = ((DATA_TYPE) i*(j+3) + 3) / n;
+    }
+  }
+  for (i = 0; i < n; i += n - 1) {
+    for (j = 0; j < n; j++) { 
+      A[i][j] = ((DATA_TYPE) i*(j+2) + 2) / n;
+      B[i][j] = ((DATA_TYPE) i*(j+3) + 3) / n;
+    }
+  }
+}
+
+
+/* DCE code. Must scan the entire live-out data.
+   Can be used also to check the correctness of the output. */
+static
+void print_array(int n,
+		 DATA_TYPE POLYBENCH_2D(A,N,N,n,n))
+
+{
+  int i, j;
+
+  POLYBENCH_DUMP_START;
+  POLYBENCH_DUMP_BEGIN("A\n");
+  for (i = 0; i < n; i++) {
+    for (j = 0; j < n; j++) {
+      fprintf(POLYBENCH_DUMP_TARGET, DATA_PRINTF_MODIFIER, A[i][j]);
+    }
+    fprintf(POLYBENCH_DUMP_TARGET, "\n");
+  }
+  POLYBENCH_DUMP_END("A");
+  POLYBENCH_DUMP_FINISH;
+}
+
+
+/* Main computational kernel. The whole function will be timed,
+   including the call and return. */
+static
+void kernel_jacobi_2d(int tsteps,
+			    int n,
+			    DATA_TYPE POLYBENCH_2D(A,N,N,n,n),
+			    DATA_TYPE POLYBENCH_2D(B,N,N,n,n))
+{
+  int t, i, j;
+
+#pragma scop
+  for (t = 0; t < _PB_TSTEPS; t++) {
+   #pragma omp parallel for private(j) schedule(static)
+    for (i = 1; i < _PB_N - 1; i++) {
+	    for (j = 1; j < _PB_N - 1; j++) {
+	      B[i][j] = SCALAR_VAL(0.2) * (A[i][j] + A[i][j-1] + A[i][1+j] + A[1+i][j] + A[i-1][j]);
+      }
+    }
+    #pragma omp parallel for private(j) schedule(static)
+    for (i = 1; i < _PB_N - 1; i++) {
+	    for (j = 1; j < _PB_N - 1; j++) {
+	      A[i][j] = SCALAR_VAL(0.2) * (B[i][j] + B[i][j-1] + B[i][1+j] + B[1+i][j] + B[i-1][j]);
+      }
+    }
+  }
+#pragma endscop
+
+}
+
+
+/* Sum of the live-out data, read_output.py compares it against the
+   double precision build. */
+static
+double checksum_array(int n,
+		      DATA_TYPE POLYBENCH_2D(A,N,N,n,n))
+{
+  int i, j;
+  double sum = 0.0;
+
+  for (i = 0; i < n; i++)
+    for (j = 0; j < n; j++)
+      sum += A[i][j];
+
+  return sum;
+}
+
+
+int main(int argc, char** argv)
+{
+  /* Retrieve problem size. */
+  int n = N;
+  int tsteps = TSTEPS;
+
+  /* Variable declaration/allocation. */
+  POLYBENCH_2D_ARRAY_DECL(A, DATA_TYPE, N, N, n, n);
+  POLYBENCH_2D_ARRAY_DECL(B, DATA_TYPE, N, N, n, n);
+
+#if NUMA_INTERLEAVE
+  if (numa_available() >= 0) {
+    numa_interleave_memory(POLYBENCH_ARRAY(A), sizeof(DATA_TYPE) * (n + POLYBENCH_PADDING_FACTOR) * (n + POLYBENCH_PADDING_FACTOR), numa_all_nodes_ptr);
+    numa_interleave_memory(POLYBENCH_ARRAY(B), sizeof(DATA_TYPE) * (n + POLYBENCH_PADDING_FACTOR) * (n + POLYBENCH_PADDING_FACTOR), numa_all_nodes_ptr);
+  }
+#endif
+
+  /* Initialize array(s). */
+  init_array (n, POLYBENCH_ARRAY(A), POLYBENCH_ARRAY(B));
+
+  printf("N: %d, Placement: %s\n", N, NUMA_INTERLEAVE ? "interleave" : "first-touch");
+
+  flush_cache();
+
+  struct timespec start, end; 
+  clock_gettime(CLOCK_MONOTONIC_RAW, &start);
+  
+  kernel_jacobi_2d(tsteps, n, POLYBENCH_ARRAY(A), POLYBENCH_ARRAY(B));
+
+  clock_gettime(CLOCK_MONOTONIC_RAW, &end);
+
+  printf("Time: %f\n", (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec));
+  printf("Checksum: %.15e\n", checksum_array(n, POLYBENCH_ARRAY(A)));
+
+  // Don't forget to free allocated memory
+  POLYBENCH_FREE_ARRAY(A);
+  POLYBENCH_FREE_ARRAY(B);
+
+  return 0;
+}
\ No newline at end of file
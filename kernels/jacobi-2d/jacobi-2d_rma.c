@@ -3,6 +3,8 @@
 #include <string.h>
 #include <math.h>
 #include <mpi.h>
+#include <mpi_timing.h>
+#include <time.h>
 
 /* Include polybench common header. */
 #include <polybench.h>
@@ -284,8 +286,8 @@ int main(int argc, char **argv)
              POLYBENCH_ARRAY(A),
              POLYBENCH_ARRAY(B));
 
-  /* Start timer. */
-  polybench_start_instruments;
+  struct timespec start, end;
+  clock_gettime(CLOCK_MONOTONIC_RAW, &start);
 
   /* Run kernel. */
   kernel_jacobi_2d(tsteps,
@@ -299,9 +301,13 @@ int main(int argc, char **argv)
                    size,
                    cart_comm);
 
-  /* Stop and print timer. */
-  polybench_stop_instruments;
-  polybench_print_instruments;
+  clock_gettime(CLOCK_MONOTONIC_RAW, &end);
+
+  // Rank 0 prints one record with the min/max/mean time over all ranks
+  char config[64];
+  snprintf(config, sizeof(config), "\"N\": %d, \"TSTEPS\": %d", N, TSTEPS);
+  print_timing("jacobi-2d_rma", timing_run_index(argc, argv), config,
+               (end.tv_sec - start.tv_sec) + 1e-9 * (end.tv_nsec - start.tv_nsec), MPI_COMM_WORLD);
 
   // // Gather all data in rank 0
 
@@ -0,0 +1,211 @@
+import argparse
+import glob
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+
+matplotlib.use("Agg")  # Workers never open windows
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+# Remembers the data each group was last drawn from, so unchanged groups are skipped
+cache_file = ".plot_cache.json"
+
+figures = ["runtime", "speedup", "efficiency", "variance", "histogram"]
+
+columns = ["Kernel", "Size", "Processes", "Nodes", "Type", "Mean Runtime", "STD"]
+run_columns = ["Kernel", "Size", "Processes", "Nodes", "Type", "Runtime"]
+
+
+def load_results(inputs):
+    """Reads every runtime_analysis CSV below the given files/directories into one DataFrame,
+    and the single runs read_output.py saves next to each of them into another."""
+    files = []
+    for path in inputs:
+        if os.path.isdir(path):
+            # read_output.py writes other tables next to runtime_analysis.csv
+            files += sorted(glob.glob(os.path.join(path, "**", "runtime_analysis.csv"), recursive=True))
+        else:
+            files.append(path)
+
+    frames, run_frames = [], []
+    for file in files:
+        df = pd.read_csv(file)
+        # Older tables report the max over ranks and have no node count
+        df = df.rename(columns={"Max Runtime": "Mean Runtime"})
+        if "Nodes" not in df.columns:
+            df["Nodes"] = 1
+        # E.g. layout_analysis.csv, which compares precisions and paddings instead
+        if not set(columns).issubset(df.columns):
+            print(f"Skipping {file}: not a runtime table")
+            continue
+        frames.append(df[columns])
+
+        # Older result sets only have the means
+        runs_file = os.path.join(os.path.dirname(file), "runtime_runs.csv")
+        if os.path.exists(runs_file):
+            run_frames.append(pd.read_csv(runs_file)[run_columns])
+
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+    runs = pd.concat(run_frames, ignore_index=True) if run_frames else pd.DataFrame(columns=run_columns)
+    return pd.concat(frames, ignore_index=True), runs
+
+
+def summarize(df, reference_runtime):
+    """One row per (Type, Processes) with runtime, spread, speedup and efficiency."""
+
+    def combine(rows):
+        # Spread within the runs of a row plus spread between the rows
+        return pd.Series({
+            "Runtime": rows["Mean Runtime"].mean(),
+            "STD": np.sqrt((rows["STD"] ** 2).mean() + rows["Mean Runtime"].var(ddof=0)),
+        })
+
+    summary = df.groupby(["Type", "Processes"]).apply(combine).reset_index()
+
+    if reference_runtime is None:
+        # No std run: every type is compared to its own smallest process count
+        first = summary.sort_values("Processes").groupby("Type").first()
+        reference = summary["Type"].map(first["Runtime"] * first["Processes"])
+    else:
+        reference = reference_runtime
+
+    summary["Speedup"] = reference / summary["Runtime"]
+    summary["Efficiency"] = summary["Speedup"] / summary["Processes"]
+    summary["CV"] = summary["STD"] / summary["Runtime"]
+    return summary
+
+
+def line_plot(summary, column, ylabel, title, path, band=False):
+    plt.figure(figsize=(12, 6))
+    for iface, data in summary.groupby("Type"):
+        data = data.sort_values("Processes")
+        plt.plot(data["Processes"], data[column], label=iface, marker="o")
+        if band:
+            plt.fill_between(data["Processes"],
+                             data[column] - data["STD"],
+                             data[column] + data["STD"], alpha=0.2)
+    plt.xlabel("Number of Processes")
+    plt.ylabel(ylabel)
+    plt.title(title)
+    # Outside the axes, the variant sweeps easily give a few dozen series
+    num_series = summary["Type"].nunique()
+    plt.legend(loc="upper left", bbox_to_anchor=(1.02, 1), fontsize="small", ncol=1 + num_series // 25)
+    plt.grid()
+    plt.savefig(path, bbox_inches="tight")
+    plt.close()
+
+
+def histogram_plot(runs, title, path):
+    # Distribution of the single runs of every type at its largest process count
+    types = sorted(runs["Type"].unique())
+    ncols = min(4, len(types))
+    nrows = -(-len(types) // ncols)
+    fig, axes = plt.subplots(nrows, ncols, figsize=(4 * ncols, 3 * nrows), squeeze=False, layout="constrained")
+    for ax in axes.flat[len(types):]:
+        ax.set_visible(False)
+    for ax, iface in zip(axes.flat, types):
+        data = runs[runs["Type"] == iface]
+        data = data[data["Processes"] == data["Processes"].max()]
+        ax.hist(data["Runtime"], bins=10, color="white", edgecolor="black")
+        ax.axvline(data["Runtime"].median(), color="blue", label="Median")
+        ax.set_title(f"{iface}\n{data['Processes'].iloc[0]} processes ({len(data)} runs)", fontsize="small")
+        ax.set_xlabel("Runtime (s)")
+        ax.locator_params(axis="x", nbins=4)
+        ax.grid(True, linestyle="--", alpha=0.5)
+        ax.legend(fontsize="small")
+    fig.suptitle(title)
+    fig.savefig(path)
+    plt.close(fig)
+
+
+def render_group(kernel, size, nodes, df, runs, reference_runtime, output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    summary = summarize(df, reference_runtime)
+    title = f"{kernel} (Size {size}, {nodes} node{'s' if nodes > 1 else ''})"
+
+    line_plot(summary, "Runtime", "Runtime (s)", f"Runtime, {title}",
+              os.path.join(output_dir, "runtime.png"), band=True)
+    line_plot(summary, "Speedup", "Speedup", f"Speedup, {title}",
+              os.path.join(output_dir, "speedup.png"))
+    line_plot(summary, "Efficiency", "Efficiency", f"Efficiency, {title}",
+              os.path.join(output_dir, "efficiency.png"))
+    line_plot(summary, "CV", "Coefficient of variation (STD / mean)", f"Variability, {title}",
+              os.path.join(output_dir, "variance.png"))
+    if not runs.empty:
+        histogram_plot(runs, f"Runtime distribution, {title}", os.path.join(output_dir, "histogram.png"))
+    return output_dir
+
+
+def data_hash(df, runs, reference_runtime):
+    content = (
+        df.sort_values(list(df.columns)).to_csv(index=False)
+        + runs.sort_values(list(runs.columns)).to_csv(index=False)
+        + repr(reference_runtime)
+    )
+    return hashlib.sha1(content.encode()).hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render all figures of a results set in parallel.")
+    parser.add_argument("inputs", nargs="*", default=["runtime_analysis"],
+                        help="runtime_analysis CSV files or directories containing them (default = runtime_analysis)")
+    parser.add_argument("--output", default="plots", help="Output directory")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(), help="Number of worker processes")
+    parser.add_argument("--force", action="store_true", help="Redraw figures even if their data is unchanged")
+    args = parser.parse_args()
+
+    df, runs = load_results(args.inputs)
+    if df.empty:
+        print("Error: No results found.")
+        exit(1)
+
+    cache_path = os.path.join(args.output, cache_file)
+    cache = {}
+    if os.path.exists(cache_path) and not args.force:
+        with open(cache_path) as f:
+            cache = json.load(f)
+
+    jobs = {}
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for (kernel, size), kernel_df in df.groupby(["Kernel", "Size"]):
+            # Speedup is relative to the mean of all sequential runs of this kernel and size
+            std_runs = kernel_df[kernel_df["Type"] == "std"]["Mean Runtime"]
+            reference_runtime = std_runs.mean() if len(std_runs) else None
+
+            for nodes, group in kernel_df.groupby("Nodes"):
+                output_dir = os.path.join(args.output, kernel, f"size_{size}", f"nodes_{nodes}")
+                key = f"{kernel}/{size}/{nodes}"
+                group_runs = runs[
+                    (runs["Kernel"] == kernel) & (runs["Size"] == size) & (runs["Nodes"] == nodes)
+                ]
+                digest = data_hash(group, group_runs, reference_runtime)
+                # The histogram needs the single runs, older result sets only have the means
+                expected = figures if len(group_runs) else [fig for fig in figures if fig != "histogram"]
+                drawn = all(os.path.exists(os.path.join(output_dir, f"{fig}.png")) for fig in expected)
+                if cache.get(key) == digest and drawn:
+                    continue
+
+                future = pool.submit(render_group, kernel, size, nodes, group, group_runs, reference_runtime, output_dir)
+                jobs[key] = (future, digest)
+
+        for key, (future, digest) in jobs.items():
+            print(f"Plotted {future.result()}")
+            cache[key] = digest
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(cache_path, "w") as f:
+        json.dump(cache, f, indent=4)
+
+    skipped = df.groupby(["Kernel", "Size", "Nodes"]).ngroups - len(jobs)
+    print(f"{len(jobs)} groups plotted, {skipped} unchanged")
+
+
+if __name__ == "__main__":
+    main()
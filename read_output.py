@@ -1,4 +1,5 @@
 import argparse
+import json
 import os
 import re
 import pandas as pd
@@ -43,7 +44,12 @@ else:
 print(f"Processing directory: {output_dir}")
 
 rows = []
+run_rows = []  # One row per single run, an Euler .out file holds all runs of a job
 time_pattern = re.compile(r"Time:\s*([\d.]+)")
+checksum_pattern = re.compile(r"Checksum:\s*(\S+)")
+
+# Largest relative checksum error accepted per data type, against the double precision build
+tolerances = {"double": 1e-12, "float": 1e-4}
 
 # Process the provided or determined benchmark folder
 dirs = [
@@ -70,6 +76,12 @@ for dir in dirs:
         with open(os.path.join(out_dir, file), "r") as f:
             lines = f.readlines()
 
+        # Shared-memory kernels print a checksum of their result after the time
+        checksums = [
+            float(match.group(1)) for match in map(checksum_pattern.search, lines) if match
+        ]
+        checksum = np.mean(checksums) if checksums else np.nan
+
         valid_lines = []
         for line in lines:
             match = time_pattern.search(line)
@@ -87,15 +99,20 @@ for dir in dirs:
                     continue
 
         if "mpi" in run_type:
-            runs = [
-                valid_lines[i:i + num_processes]
-                for i in range(0, len(valid_lines), num_processes)
-            ]
-            max_runtimes = []
-            for run in runs:
-                if len(run) == num_processes:
-                    max_runtime = max(run)
-                    max_runtimes.append(max_runtime)
+            # MPI kernels print one JSON record per run with the max over all ranks
+            records = [json.loads(line) for line in lines if line.startswith("{")]
+            max_runtimes = [record["max"] for record in records]
+
+            # Older outputs have one "Rank %d, Time" line per rank instead
+            if not records:
+                runs = [
+                    valid_lines[i:i + num_processes]
+                    for i in range(0, len(valid_lines), num_processes)
+                ]
+                for run in runs:
+                    if len(run) == num_processes:
+                        max_runtime = max(run)
+                        max_runtimes.append(max_runtime)
             mean_runtime = np.mean(max_runtimes)
             variability = np.std(max_runtimes)
             rows.append({
@@ -107,7 +124,7 @@ for dir in dirs:
                 "Mean Runtime": mean_runtime,
                 "STD": variability
             })
-        elif run_type == "omp":
+        elif "omp" in run_type:
             if valid_lines:
                 mean_runtime = np.mean(valid_lines)
                 variability = np.std(valid_lines)
@@ -118,9 +135,10 @@ for dir in dirs:
                     "Nodes": 1,
                     "Type": run_type,
                     "Mean Runtime": mean_runtime,
-                    "STD": variability
+                    "STD": variability,
+                    "Checksum": checksum
                 })
-        elif run_type == "std":
+        else:
             if valid_lines:
                 mean_runtime = np.mean(valid_lines)
                 variability = np.std(valid_lines)
@@ -131,9 +149,18 @@ for dir in dirs:
                     "Nodes": 1,
                     "Type": run_type,
                     "Mean Runtime": mean_runtime,
-                    "STD": variability  
+                    "STD": variability,
+                    "Checksum": checksum
                 })
 
+        # Keep every single run for the runtime distributions of plot_all.py
+        run_times = max_runtimes if "mpi" in run_type else valid_lines
+        for runtime in run_times:
+            run_rows.append({
+                **{key: rows[-1][key] for key in ["Kernel", "Size", "Processes", "Nodes", "Type"]},
+                "Runtime": runtime
+            })
+
 # Create a DataFrame
 df = pd.DataFrame(rows)
 
@@ -145,3 +172,61 @@ os.makedirs(analysis_dir, exist_ok=True)
 output_file = os.path.join(analysis_dir, "runtime_analysis.csv")
 df.to_csv(output_file, index=False)
 print(f"Runtime analysis saved to {output_file}")
+
+runs_file = os.path.join(analysis_dir, "runtime_runs.csv")
+pd.DataFrame(run_rows, columns=["Kernel", "Size", "Processes", "Nodes", "Type", "Runtime"]).to_csv(
+    runs_file, index=False
+)
+print(f"Single runs saved to {runs_file}")
+
+# Compare the data layouts (--precisions/--paddings in driver.py) side by side,
+# each against the double precision, unpadded build of the same interface
+def split_layout(run_type):
+    dtype = re.search(r"_DTYPE_([a-z]+)", run_type)
+    pad = re.search(r"_PAD_(\d+)", run_type)
+    interface = re.sub(r"_DTYPE_[a-z]+|_PAD_\d+", "", run_type)
+    return interface, dtype.group(1) if dtype else "double", int(pad.group(1)) if pad else 0
+
+
+if not df.empty and df["Type"].str.contains("_DTYPE_|_PAD_").any():
+    layouts = df.dropna(subset=["Checksum"]).copy()
+    layouts[["Interface", "Precision", "Padding"]] = [
+        split_layout(run_type) for run_type in layouts["Type"]
+    ]
+
+    keys = ["Kernel", "Size", "Processes", "Interface"]
+    layouts = layouts.groupby(keys + ["Precision", "Padding"], as_index=False)[
+        ["Mean Runtime", "Checksum"]
+    ].mean()
+
+    reference = layouts[(layouts["Precision"] == "double") & (layouts["Padding"] == 0)]
+    layouts = layouts.join(
+        reference.set_index(keys)[["Mean Runtime", "Checksum"]], on=keys, rsuffix=" Reference"
+    )
+    layouts["Speedup"] = layouts["Mean Runtime Reference"] / layouts["Mean Runtime"]
+    layouts["Relative Error"] = (
+        (layouts["Checksum"] - layouts["Checksum Reference"]).abs()
+        / layouts["Checksum Reference"].abs()
+    )
+    layouts["Accurate"] = layouts["Relative Error"] <= layouts["Precision"].map(tolerances)
+
+    layout_file = os.path.join(analysis_dir, "layout_analysis.csv")
+    layouts.drop(columns=["Mean Runtime Reference", "Checksum Reference"]).to_csv(
+        layout_file, index=False
+    )
+
+    print(
+        layouts.pivot_table(
+            index=keys,
+            columns=["Precision", "Padding"],
+            values=["Mean Runtime", "Speedup", "Relative Error"],
+        ).to_string()
+    )
+
+    inaccurate = layouts[layouts["Relative Error"].notna() & ~layouts["Accurate"]]
+    for _, row in inaccurate.iterrows():
+        print(
+            f"Warning: {row['Kernel']} {row['Interface']} ({row['Precision']}, padding {row['Padding']}, "
+            f"{row['Processes']} processes) is off by {row['Relative Error']:.2e}"
+        )
+    print(f"Layout analysis saved to {layout_file}")
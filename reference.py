@@ -0,0 +1,150 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+# NumPy versions of the kernels, using the same init formulas as the C code.
+# Large arrays can be memory-mapped and are then processed in bands of rows.
+
+default_chunk_bytes = 256 * 1024 * 1024
+
+
+def allocate(shape, dtype, mmap_dir=None, name="A"):
+    if mmap_dir is None:
+        return np.empty(shape, dtype=dtype)
+    os.makedirs(mmap_dir, exist_ok=True)
+    return np.lib.format.open_memmap(
+        os.path.join(mmap_dir, f"{name}.npy"), mode="w+", dtype=dtype, shape=shape
+    )
+
+
+def row_chunks(n_rows, n_cols, dtype, chunk_rows=None, start=0, stop=None):
+    # Bands of rows of about default_chunk_bytes each
+    if stop is None:
+        stop = n_rows
+    if chunk_rows is None:
+        chunk_rows = max(1, default_chunk_bytes // (n_cols * np.dtype(dtype).itemsize))
+    for r0 in range(start, stop, chunk_rows):
+        yield slice(r0, min(r0 + chunk_rows, stop))
+
+
+def init_gemver(n, dtype=np.float64, mmap_dir=None, chunk_rows=None):
+    fn = dtype(n)
+    i = np.arange(n)
+    scale = (i + 1).astype(dtype) / fn
+
+    data = {
+        "alpha": dtype(1.5),
+        "beta": dtype(1.2),
+        "u1": i.astype(dtype),
+        "u2": scale / dtype(2.0),
+        "v1": scale / dtype(4.0),
+        "v2": scale / dtype(6.0),
+        "y": scale / dtype(8.0),
+        "z": scale / dtype(9.0),
+        "x": np.zeros(n, dtype=dtype),
+        "w": np.zeros(n, dtype=dtype),
+    }
+
+    A = allocate((n, n), dtype, mmap_dir, "A")
+    for rows in row_chunks(n, n, np.int64, chunk_rows):
+        # (i*j % N) / N, in 64 bit so that large N does not overflow
+        A[rows] = (np.outer(i[rows], i) % n).astype(dtype) / dtype(n)
+    data["A"] = A
+    return data
+
+
+def kernel_gemver(alpha, beta, u1, u2, v1, v2, y, z, x, w, A, chunk_rows=None):
+    n = A.shape[0]
+
+    # Rank-2 update fused with x += beta * A^T y, one band of rows at a time
+    for rows in row_chunks(n, n, A.dtype, chunk_rows):
+        band = A[rows]
+        band += np.outer(u1[rows], v1)
+        band += np.outer(u2[rows], v2)
+        x += beta * (y[rows] @ band)
+
+    x += z
+
+    for rows in row_chunks(n, n, A.dtype, chunk_rows):
+        w[rows] += alpha * (A[rows] @ x)
+
+
+def init_jacobi_2d(n, dtype=np.float64, mmap_dir=None, chunk_rows=None):
+    A = allocate((n, n), dtype, mmap_dir, "A")
+    B = allocate((n, n), dtype, mmap_dir, "B")
+    j = np.arange(n, dtype=dtype)
+    for rows in row_chunks(n, n, dtype, chunk_rows):
+        i = np.arange(rows.start, rows.stop, dtype=dtype)[:, None]
+        A[rows] = (i * (j + 2) + 2) / dtype(n)
+        B[rows] = (i * (j + 3) + 3) / dtype(n)
+    return A, B
+
+
+def stencil_views(dst, src, rows):
+    # Views for one band of interior rows, created once and reused every step
+    inner = slice(rows.start, rows.stop)
+    return (
+        dst[inner, 1:-1],
+        src[inner, 1:-1],
+        src[inner, :-2],
+        src[inner, 2:],
+        src[rows.start + 1:rows.stop + 1, 1:-1],
+        src[rows.start - 1:rows.stop - 1, 1:-1],
+    )
+
+
+def stencil(views, scale):
+    # Same summation order as the C kernels, accumulated in place in dst
+    out, center, left, right, down, up = views
+    np.add(center, left, out=out)
+    out += right
+    out += down
+    out += up
+    out *= scale
+
+
+def kernel_jacobi_2d(tsteps, A, B, chunk_rows=None):
+    n = A.shape[0]
+    scale = A.dtype.type(0.2)
+    bands = list(row_chunks(n, n, A.dtype, chunk_rows, start=1, stop=n - 1))
+    to_B = [stencil_views(B, A, rows) for rows in bands]
+    to_A = [stencil_views(A, B, rows) for rows in bands]
+
+    for _ in range(tsteps):
+        for views in to_B:
+            stencil(views, scale)
+        for views in to_A:
+            stencil(views, scale)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="NumPy reference implementation of the kernels")
+    parser.add_argument("--kernel", choices=["gemver", "jacobi-2d"], required=True)
+    parser.add_argument("--size", type=int, required=True, help="N")
+    parser.add_argument("--tsteps", type=int, default=500, help="TSTEPS (jacobi-2d only)")
+    parser.add_argument("--dtype", choices=["float64", "float32"], default="float64")
+    parser.add_argument("--mmap-dir", default=None, help="Memory-map the matrices into this directory")
+    parser.add_argument("--chunk-rows", type=int, default=None, help="Rows per band (default ~256 MB)")
+    args = parser.parse_args()
+
+    dtype = np.dtype(args.dtype).type
+
+    if args.kernel == "gemver":
+        data = init_gemver(args.size, dtype, args.mmap_dir, args.chunk_rows)
+        start = time.perf_counter()
+        kernel_gemver(**data, chunk_rows=args.chunk_rows)
+    else:
+        A, B = init_jacobi_2d(args.size, dtype, args.mmap_dir, args.chunk_rows)
+        start = time.perf_counter()
+        kernel_jacobi_2d(args.tsteps, A, B, args.chunk_rows)
+    end = time.perf_counter()
+
+    # Same format as the C kernels, so read_output.py can parse it
+    print(f"N: {args.size}")
+    print(f"Time: {end - start:f}")
+
+
+if __name__ == "__main__":
+    main()
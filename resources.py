@@ -0,0 +1,132 @@
+import csv
+import glob
+import math
+import os
+
+# Runtime tables written by read_output.py, used as the sweep history
+history_files = os.path.join("runtime_analysis", "*", "runtime_analysis.csv")
+
+dtype_sizes = {"double": 8, "float": 4}
+
+# Headroom on top of the arrays: MPI runtime, perf, the flush_cache buffer, ...
+base_memory = 512  # MB per process
+memory_margin = 1.25
+
+# Walltime = num_runs * (runtime + init) * time_margin + time_overhead
+init_bandwidth = 1e9  # Bytes/s written by the serial init loops
+time_margin = 1.5
+time_overhead = 60  # Seconds for module load, srun startup and hostname
+default_time = 4 * 60  # Used when there is no history for the kernel
+
+
+def process_grid(p):
+    # Same 2D grid as MPI_Dims_create(p, 2, dims): as square as possible, dims[0] >= dims[1]
+    for cols in range(math.isqrt(p), 0, -1):
+        if p % cols == 0:
+            return p // cols, cols
+
+
+def working_set(kernel, interface, sizes, p, params):
+    """Bytes held by the largest process of one run."""
+    n = sizes["N"]
+    pad = params.get("PAD", 0)  # Only set for the shared-memory interfaces
+
+    if kernel == "gemver":
+        if "mpi_2d" in interface:
+            rows, cols = process_grid(p)
+            h, w = math.ceil(n / rows), math.ceil(n / cols)
+            # Block of A, u1, u2, y, w per block row, v1, v2, z, x per block col
+            elements = h * w + 4 * h + 4 * w
+        elif "mpi" in interface:
+            h = math.ceil(n / p)
+            # Rows of A, u1, u2, y, z, w per row, v1, v2, x in full
+            elements = h * n + 5 * h + 3 * n
+        else:
+            elements = n * (n + pad) + 8 * n
+
+    elif kernel == "jacobi-2d":
+        if "mpi" in interface:
+            rows, cols = process_grid(p)
+            ghost = 2 * params["HALO"] if "HALO" in params else 1
+            h, w = (n - 2) // rows + 2 * ghost, (n - 2) // cols + 2 * ghost
+            # Blocks of A and B, plus the full result rank 0 gathers
+            elements = 2 * h * w + n * n
+        else:
+            elements = 2 * (n + pad) ** 2
+
+    else:
+        raise ValueError(f"No working set model for kernel {kernel}")
+
+    return elements * dtype_sizes[params.get("DTYPE", "double")]
+
+
+def load_history(pattern=history_files):
+    history = []
+    for path in sorted(glob.glob(pattern)):
+        with open(path, newline="") as f:
+            for row in csv.DictReader(f):
+                # Older tables report the max over ranks, newer ones the mean over runs
+                runtime = row.get("Mean Runtime") or row.get("Max Runtime")
+                if not runtime:
+                    continue
+                history.append({
+                    "Kernel": row["Kernel"],
+                    "Size": int(row["Size"]),
+                    "Processes": int(row["Processes"]),
+                    "Type": row["Type"],
+                    "Runtime": float(runtime) + 3 * float(row.get("STD") or 0),
+                })
+    return history
+
+
+def expected_runtime(history, label, run_type, size, p):
+    """Worst recorded runtime of a configuration in seconds, or None without history.
+
+    label is the kernel as read_output.py records it (e.g. jacobi-2d_TSTEPS_500).
+    Without an exact match the closest recorded configuration of the same kernel
+    and type is scaled by size^2 (both kernels are O(N^2) per step) and 1/p.
+    """
+    rows = [
+        row for row in history if row["Kernel"] == label and row["Type"] == run_type
+    ]
+    if not rows:
+        return None
+
+    exact = [row["Runtime"] for row in rows if row["Size"] == size and row["Processes"] == p]
+    if exact:
+        return max(exact)
+
+    nearest = min(
+        rows,
+        key=lambda row: abs(math.log(size / row["Size"])) + abs(math.log(p / row["Processes"])),
+    )
+    return nearest["Runtime"] * (size / nearest["Size"]) ** 2 * nearest["Processes"] / p
+
+
+def format_time(seconds):
+    minutes = max(1, math.ceil(seconds / 60))
+    days, minutes = divmod(minutes, 24 * 60)
+    hours, minutes = divmod(minutes, 60)
+    if days:
+        return f"{days}-{hours:02}:{minutes:02}:00"
+    return f"{hours:02}:{minutes:02}:00"
+
+
+def slurm_request(history, kernel, label, interface, run_type, sizes, p, params, num_runs):
+    """Returns (--mem-per-cpu in MB, --time) for one sbatch job."""
+    process_bytes = working_set(kernel, interface, sizes, p, params)
+    process_memory = process_bytes * memory_margin / 2**20 + base_memory
+
+    if "mpi" in interface or "omp" not in interface:
+        # One cpu per task
+        mem_per_cpu = math.ceil(process_memory)
+    else:
+        # Threads share the memory of the single task
+        mem_per_cpu = math.ceil(process_memory / p)
+
+    runtime = expected_runtime(history, label, run_type, sizes["N"], p)
+    if runtime is None:
+        return mem_per_cpu, format_time(default_time)
+
+    init = process_bytes / init_bandwidth
+    return mem_per_cpu, format_time(num_runs * (runtime + init) * time_margin + time_overhead)
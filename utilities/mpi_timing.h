@@ -0,0 +1,52 @@
+/**
+ * Rank 0 aggregated timing output for the MPI kernels.
+ */
+#ifndef _MPI_TIMING_H
+# define _MPI_TIMING_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <mpi.h>
+
+/* Run index passed by the driver as the first argument (0 if absent). */
+static int timing_run_index(int argc, char **argv)
+{
+  return argc > 1 ? atoi(argv[1]) : 0;
+}
+
+/* Gathers the kernel time of every rank on rank 0, which prints a single
+   JSON record for the run, e.g.
+   {"kernel": "gemver_mpi", "run": 0, "N": 10000, "ranks": 4, "min": 0.1, "max": 0.2, "mean": 0.15}
+   config holds the configuration as "key": value pairs, e.g. "\"N\": 10000". */
+static void print_timing(const char *kernel,
+                         int run,
+                         const char *config,
+                         double time,
+                         MPI_Comm comm)
+{
+  int rank, size;
+  MPI_Comm_rank(comm, &rank);
+  MPI_Comm_size(comm, &size);
+
+  double *times = NULL;
+  if (rank == 0)
+    times = (double *) malloc(size * sizeof(double));
+
+  MPI_Gather(&time, 1, MPI_DOUBLE, times, 1, MPI_DOUBLE, 0, comm);
+
+  if (rank == 0) {
+    double min = times[0], max = times[0], sum = 0.0;
+    for (int i = 0; i < size; i++) {
+      min = times[i] < min ? times[i] : min;
+      max = times[i] > max ? times[i] : max;
+      sum += times[i];
+    }
+
+    printf("{\"kernel\": \"%s\", \"run\": %d, %s, \"ranks\": %d, \"min\": %f, \"max\": %f, \"mean\": %f}\n",
+           kernel, run, config, size, min, max, sum / size);
+    fflush(stdout);
+    free(times);
+  }
+}
+
+#endif /* !_MPI_TIMING_H */